@@ -52,6 +52,24 @@ class Element(ABC):
         """Generate LaTeX snippets for this element."""
         raise NotImplementedError
 
+    def cached_build(self) -> list[str]:
+        """:meth:`build` memoized for repeated renders of the same element.
+
+        Elements are normally constructed once and then rendered to several
+        outputs (tex, pdf, png...); the snippets only need to be generated
+        the first time. After mutating fields, call :meth:`invalidate_build`
+        so the next render sees the change.
+        """
+        cached = getattr(self, "_cached_build", None)
+        if cached is None:
+            cached = self.build()
+            self._cached_build = cached
+        return cached
+
+    def invalidate_build(self) -> None:
+        """Drop the memoized :meth:`build` output."""
+        self.__dict__.pop("_cached_build", None)
+
 
 @dataclass
 class Leaf(Element):
@@ -2,14 +2,137 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
+import os
 import shutil
 import subprocess
 import tempfile
+import uuid
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+try:
+    # Optional in-process rasterizer: one C library call instead of a
+    # subprocess launch per PNG. to_pil() needs Pillow, so require both.
+    import PIL.Image  # noqa: F401
+    import pypdfium2 as _pdfium
+except ImportError:
+    _pdfium = None
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> str | None:
+    """PATH lookup cached for the process lifetime.
+
+    shutil.which walks and stats every PATH entry; the toolchain does not
+    change mid-process, so probe each binary once.
+    """
+    return shutil.which(name)
+
+
+def refresh_tool_cache() -> None:
+    """Rescan PATH for the LaTeX and conversion toolchain.
+
+    :func:`_which` caches lookups for the process lifetime; call this after
+    PATH changes (e.g. a TeX distribution installed mid-session). The shared
+    compiler/converter singletons are reset too, since they snapshot tool
+    availability at construction.
+    """
+    _which.cache_clear()
+    from . import layers
+
+    layers._compiler.cache_clear()
+    layers._converter.cache_clear()
+
+
+def _cache_root() -> Path:
+    """Base directory for caches shared across plotnn invocations.
+
+    ``PLOTNN_CACHE_DIR`` overrides the location outright (e.g. to point at a
+    CI cache volume); otherwise the XDG cache convention applies.
+    """
+    override = os.environ.get("PLOTNN_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "plotnn"
+
+
+def _tex_env() -> dict[str, str] | None:
+    """Environment for LaTeX subprocesses with a persistent TEXMFVAR cache.
+
+    Reusing TEXMFVAR across runs lets pdflatex/latexmk skip regenerating
+    format files and font maps on every diagram build. Falls back to the
+    inherited environment when the cache directory cannot be created.
+    """
+    try:
+        tex_cache = _cache_root() / "tex"
+        tex_cache.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return {**os.environ, "TEXMFVAR": str(tex_cache)}
+
+
+def persistent_work_dir(tex_content: str) -> Path:
+    """Working directory keyed by document hash, reused across compiles.
+
+    Leaving .aux/.fls/.fdb_latexmk in place lets repeat compiles of the same
+    source skip the first-pass bookkeeping work. The tree lives under the
+    per-user cache root, not the shared system temp dir, so it is private to
+    the user and covered by :func:`clear_cache`. Suitable as the ``work_dir``
+    argument of :meth:`LaTeXCompiler.compile_to_pdf` when recompiling the
+    same document with the PDF cache disabled.
+    """
+    digest = hashlib.sha256(tex_content.encode("utf-8")).hexdigest()[:16]
+    d = _cache_root() / "work" / digest
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def clear_cache() -> None:
+    """Delete all persistent plotnn caches.
+
+    Removes the hash-keyed working directories, the content-addressed PDF
+    cache and the TEXMFVAR cache. Safe to call at any time; everything is
+    rebuilt on demand.
+    """
+    shutil.rmtree(_cache_root(), ignore_errors=True)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hardlink ``dst`` to ``src``, falling back to a byte copy.
+
+    A link is an O(1) metadata operation regardless of PDF size; it fails
+    across devices or on filesystems without hardlink support, where
+    copyfile takes over.
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _pdf_cache_path(tex_content: str, cache_dir: Path | None = None) -> Path | None:
+    """Content-addressed cache location for a compiled document, or None.
+
+    Keyed by SHA-256 of the full tex source: byte-identical documents always
+    produce the same PDF, so repeat builds can skip LaTeX entirely. A custom
+    ``cache_dir`` replaces the default per-user location.
+    """
+    if cache_dir is None:
+        cache_dir = _cache_root() / "pdf"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    digest = hashlib.sha256(tex_content.encode("utf-8")).hexdigest()
+    return cache_dir / f"{digest}.pdf"
+
 
 class LaTeXCompiler:
     """Handles LaTeX compilation to PDF.
@@ -17,14 +140,17 @@ class LaTeXCompiler:
     Now optionally persists the .tex file next ao PDF para facilitar depuração e reutilização.
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir: str | Path | None = None):
         self.available_tools = self._check_available_tools()
+        # Optional per-instance override of the content-addressed PDF cache
+        # location; None keeps the shared per-user cache.
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
 
     def _check_available_tools(self) -> dict[str, bool]:
         """Check which LaTeX tools are available."""
         return {
-            "latexmk": shutil.which("latexmk") is not None,
-            "pdflatex": shutil.which("pdflatex") is not None,
+            "latexmk": _which("latexmk") is not None,
+            "pdflatex": _which("pdflatex") is not None,
         }
 
     def compile_to_pdf(
@@ -32,6 +158,9 @@ class LaTeXCompiler:
         tex_content: str,
         out_pdf: str | Path,
         keep_tex: bool | str | Path = True,
+        work_dir: str | Path | None = None,
+        use_cache: bool = True,
+        verbose: bool = False,
     ) -> Path:
         """Compile LaTeX content to PDF.
 
@@ -45,6 +174,17 @@ class LaTeXCompiler:
             Se True, salva um arquivo .tex com o mesmo *stem* do PDF.
             Se False, não salva o .tex (comportamento antigo sem persistência).
             Se str/Path, salva o .tex exatamente nesse caminho.
+        work_dir: Path-like | None (default=None)
+            When given, compile in this directory and leave the .aux/.fls/
+            .fdb_latexmk files in place so sequential builds reuse them,
+            instead of a throwaway scratch dir. Not safe to share between
+            concurrent compiles.
+        use_cache: bool (default=True)
+            Quando False, ignora o cache de PDFs por conteúdo — útil quando
+            os arquivos .sty foram editados sem mudar o .tex gerado.
+        verbose: bool (default=False)
+            Quando True, deixa o log do LaTeX fluir para o terminal em vez
+            de descartá-lo.
         """
         out_pdf_path = Path(out_pdf).resolve()
         out_pdf_path.parent.mkdir(parents=True, exist_ok=True)
@@ -59,35 +199,143 @@ class LaTeXCompiler:
             tex_out_path = Path(keep_tex).resolve()
             tex_out_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp = Path(tmpdir)
-            tmp_tex_file = tmp / "diagram.tex"
-            tmp_tex_file.write_text(tex_content, encoding="utf-8")
-
-            if self.available_tools["latexmk"]:
-                cmd = ["latexmk", "-pdf", "-interaction=nonstopmode", "-silent", tmp_tex_file.name]
-                subprocess.run(cmd, cwd=tmp, check=True)
-            elif self.available_tools["pdflatex"]:
-                cmd = ["pdflatex", "-interaction=nonstopmode", "no-shell-escape", tmp_tex_file.name]
-                # Run twice for references
-                subprocess.run(cmd, cwd=tmp, check=False)
-                subprocess.run(cmd, cwd=tmp, check=True)
-            else:
-                raise RuntimeError("No LaTeX compiler found. Install latexmk or pdflatex.")
-
-            produced = tmp / "diagram.pdf"
-            if not produced.exists():
-                raise RuntimeError("LaTeX compilation failed to produce PDF. Check logs.")
-
-            shutil.copyfile(produced, out_pdf_path)
+        cache_path = _pdf_cache_path(tex_content, self.cache_dir) if use_cache else None
+        if cache_path is not None and cache_path.exists():
+            _link_or_copy(cache_path, out_pdf_path)
+            if tex_out_path is not None:
+                tex_out_path.write_text(tex_content, encoding="utf-8")
+            logger.info(f"PDF cache hit, copied to {out_pdf_path}")
+            return out_pdf_path
+
+        if work_dir is None and not use_cache:
+            # With the PDF cache off, repeat compiles of the same source are
+            # expected; keep their .aux/.fls between runs.
+            work_dir = persistent_work_dir(tex_content)
+        if work_dir is not None:
+            tmp = Path(work_dir)
+            tmp.mkdir(parents=True, exist_ok=True)
+        else:
+            # Compile in a scratch dir next to the destination so the finished
+            # PDF can be moved into place with an atomic rename instead of a
+            # full byte copy out of a TemporaryDirectory.
+            tmp = out_pdf_path.parent / f".plotnn-{os.getpid()}-{uuid.uuid4().hex}"
+            tmp.mkdir()
+        try:
+            produced = self._run_latex(tex_content, tmp, verbose=verbose)
+
+            if cache_path is not None:
+                _link_or_copy(produced, cache_path)
+                # The delivered PDF may share the entry's inode; read-only
+                # entries make an in-place write fail loudly instead of
+                # silently corrupting every later cache hit.
+                cache_path.chmod(0o444)
+
+            try:
+                os.replace(produced, out_pdf_path)
+            except OSError:
+                # work_dir may sit on another filesystem (e.g. /tmp); rename
+                # cannot cross devices, so fall back to a plain copy. Drop any
+                # previous (possibly read-only) export first.
+                out_pdf_path.unlink(missing_ok=True)
+                shutil.copyfile(produced, out_pdf_path)
 
             if tex_out_path is not None:
                 tex_out_path.write_text(tex_content, encoding="utf-8")
                 logger.info(f"Saved LaTeX source at {tex_out_path}")
+        finally:
+            if work_dir is None:
+                shutil.rmtree(tmp, ignore_errors=True)
 
         logger.info(f"PDF generated at {out_pdf_path}")
         return out_pdf_path
 
+    def compile_to_bytes(self, tex_content: str, work_dir: Path | None = None) -> bytes:
+        """Compile and return the PDF as bytes, never naming a destination.
+
+        For transient renders (``keep_tex=False`` PNG/SVG exports) the PDF
+        only exists to be fed to a converter; returning bytes lets callers
+        pipe it straight to the converter's stdin instead of writing it to a
+        final path and reading it back. The content cache is honored. A
+        caller-owned ``work_dir`` skips the create/destroy churn of a fresh
+        temporary directory per compile (not safe to share concurrently).
+        """
+        cache_path = _pdf_cache_path(tex_content, self.cache_dir)
+        if cache_path is not None and cache_path.exists():
+            return cache_path.read_bytes()
+
+        if work_dir is not None:
+            data = self._run_latex(tex_content, work_dir).read_bytes()
+        else:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                data = self._run_latex(tex_content, Path(tmpdir)).read_bytes()
+        if cache_path is not None:
+            # Write-then-rename so a concurrent reader never sees a partially
+            # written cache entry.
+            tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+            try:
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, cache_path)
+                cache_path.chmod(0o444)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+        return data
+
+    def _run_latex(self, tex_content: str, tmp: Path, verbose: bool = False) -> Path:
+        """Run latexmk/pdflatex in ``tmp`` and return the produced PDF path."""
+        env = _tex_env()
+        # LaTeX logs are very chatty; by default discard them instead of
+        # streaming tens of KB through the caller's terminal per compile.
+        quiet = {} if verbose else {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if self.available_tools["latexmk"]:
+            # latexmk needs a real file for its dependency tracking; it reruns
+            # internally only when cross-refs change.
+            tmp_tex_file = tmp / "diagram.tex"
+            tmp_tex_file.write_text(tex_content, encoding="utf-8")
+            cmd = [
+                "latexmk",
+                "-pdf",
+                "-interaction=nonstopmode",
+                "-halt-on-error",
+                "-silent",
+                tmp_tex_file.name,
+            ]
+            subprocess.run(cmd, cwd=tmp, check=True, env=env, **quiet)
+        elif self.available_tools["pdflatex"]:
+            # With no file argument pdflatex reads the document from stdin;
+            # -jobname keeps the output named diagram.pdf. Skipping the .tex
+            # write saves a full write + read of the source per compile.
+            src = tex_content.encode("utf-8")
+            cmd = [
+                "pdflatex",
+                "-interaction=batchmode",
+                "-halt-on-error",
+                "-jobname=diagram",
+                "-no-shell-escape",
+            ]
+            # Run twice for references. batchmode keeps pdflatex from writing
+            # its per-page progress to stdout at all, and -draftmode skips PDF
+            # shipout on the first pass, which only exists to produce the .aux.
+            draft_cmd = cmd[:1] + ["-draftmode"] + cmd[1:]
+            subprocess.run(draft_cmd, cwd=tmp, input=src, check=False, env=env, **quiet)
+            result = subprocess.run(cmd, cwd=tmp, input=src, check=False, env=env, **quiet)
+            if result.returncode != 0:
+                # Failed: re-run once in verbose mode so the exception carries
+                # the actual LaTeX error instead of a bare exit code.
+                verbose_cmd = [*cmd]
+                verbose_cmd[1] = "-interaction=nonstopmode"
+                rerun = subprocess.run(
+                    verbose_cmd, cwd=tmp, input=src, env=env, capture_output=True
+                )
+                tail = rerun.stdout[-2000:].decode("utf-8", "replace") if rerun.stdout else ""
+                raise RuntimeError(f"pdflatex failed (exit {result.returncode}):\n{tail}")
+        else:
+            raise RuntimeError("No LaTeX compiler found. Install latexmk or pdflatex.")
+
+        produced = tmp / "diagram.pdf"
+        if not produced.exists():
+            raise RuntimeError("LaTeX compilation failed to produce PDF. Check logs.")
+        return produced
+
 
 class FormatConverter:
     """Handles conversion from PDF to other formats."""
@@ -98,21 +346,53 @@ class FormatConverter:
     def _check_available_tools(self) -> dict[str, bool]:
         """Check which conversion tools are available."""
         return {
-            "pdftocairo": shutil.which("pdftocairo") is not None,
-            "magick": shutil.which("magick") is not None,
-            "convert": shutil.which("convert") is not None,
-            "gs": shutil.which("gs") is not None,
+            "pdftocairo": _which("pdftocairo") is not None,
+            "magick": _which("magick") is not None,
+            "convert": _which("convert") is not None,
+            "gs": _which("gs") is not None,
         }
 
     def pdf_to_format(
-        self, pdf_path: Path, out_path: Path, format: str, dpi: int = 300, page: int = 1
+        self,
+        pdf_path: Path | None,
+        out_path: Path,
+        format: str,
+        dpi: int = 300,
+        page: int = 1,
+        pdf_bytes: bytes | None = None,
     ) -> Path:
-        """Convert PDF to specified format."""
+        """Convert PDF to specified format.
+
+        Either ``pdf_path`` or ``pdf_bytes`` must be provided. When bytes are
+        supplied and pdftocairo is available, they are piped straight to the
+        converter's stdin, skipping a disk round-trip of the whole PDF.
+        """
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
         if format not in ("png", "svg"):
             raise ValueError("Format must be 'png' or 'svg'")
 
+        if pdf_path is None and pdf_bytes is None:
+            raise ValueError("Either pdf_path or pdf_bytes is required")
+
+        if format == "png" and _pdfium is not None:
+            return self._convert_with_pdfium(
+                pdf_bytes if pdf_bytes is not None else str(pdf_path), out_path, dpi, page
+            )
+
+        if pdf_bytes is not None and self.available_tools["pdftocairo"]:
+            return self._convert_bytes_with_pdftocairo(pdf_bytes, out_path, format, dpi, page)
+
+        if pdf_path is None:
+            # Tools below need a real file; spill the bytes to a temp path.
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_pdf:
+                tmp_pdf.write(pdf_bytes)  # type: ignore[arg-type]
+                pdf_path = Path(tmp_pdf.name)
+            try:
+                return self.pdf_to_format(pdf_path, out_path, format, dpi=dpi, page=page)
+            finally:
+                pdf_path.unlink(missing_ok=True)
+
         # Try pdftocairo first (best quality)
         if self.available_tools["pdftocairo"]:
             return self._convert_with_pdftocairo(pdf_path, out_path, format, dpi, page)
@@ -134,28 +414,60 @@ class FormatConverter:
             "Install poppler-utils, ImageMagick, or Ghostscript."
         )
 
-    def _convert_with_pdftocairo(
-        self, pdf_path: Path, out_path: Path, format: str, dpi: int, page: int
+    def _convert_with_pdfium(
+        self, src: bytes | str, out_path: Path, dpi: int, page: int
+    ) -> Path:
+        """Rasterize to PNG in-process with pypdfium2 (no subprocess startup)."""
+        doc = _pdfium.PdfDocument(src)
+        try:
+            bitmap = doc[page - 1].render(scale=dpi / 72)
+            bitmap.to_pil().save(out_path, "PNG", optimize=True)
+        finally:
+            doc.close()
+        return out_path
+
+    def _convert_bytes_with_pdftocairo(
+        self, pdf_bytes: bytes, out_path: Path, format: str, dpi: int, page: int
     ) -> Path:
-        """Convert using pdftocairo."""
-        tool = shutil.which("pdftocairo")
-        args = [f"-r {dpi}", f"-f {page}", f"-l {page}", str(pdf_path), "-singlefile"]
+        """Convert in-memory PDF bytes by piping them through pdftocairo.
 
+        The PDF goes in on stdin and, for PNG, the image comes back on
+        stdout — the conversion itself touches no files at all.
+        """
+        cmd = self._pdftocairo_cmd(format, dpi, page, "-")
+        result = subprocess.run(cmd, input=pdf_bytes, check=True, capture_output=True)
+        out_path.write_bytes(result.stdout)
+        return out_path
+
+    @staticmethod
+    def _pdftocairo_cmd(format: str, dpi: int, page: int, src: str) -> list[str]:
+        """Build a pdftocairo command reading ``src`` and writing to stdout."""
+        cmd = [_which("pdftocairo"), f"-{format}", "-r", str(dpi), "-f", str(page), "-l", str(page)]
         if format == "png":
-            base_path = out_path.with_suffix("")
-            cmd = [tool, "-png"] + args + [str(base_path)]
-        else:  # svg
-            cmd = [tool, "-svg"] + args + [str(out_path)]
+            # -singlefile is only valid for raster outputs; it suppresses the
+            # page-number suffix so the image lands on stdout unadorned.
+            cmd.append("-singlefile")
+        cmd += [src, "-"]
+        return cmd
 
-        subprocess.run(cmd, check=True)
+    def _convert_with_pdftocairo(
+        self, pdf_path: Path, out_path: Path, format: str, dpi: int, page: int
+    ) -> Path:
+        """Convert using pdftocairo, capturing the result from stdout.
 
+        Writing to stdout sidesteps the -singlefile basename dance where
+        pdftocairo appends its own extension to a stripped output path.
+        """
+        cmd = self._pdftocairo_cmd(format, dpi, page, str(pdf_path))
+        result = subprocess.run(cmd, check=True, capture_output=True)
+        out_path.write_bytes(result.stdout)
         return out_path
 
     def _convert_with_imagemagick(
         self, pdf_path: Path, out_path: Path, dpi: int, page: int
     ) -> Path:
         """Convert using ImageMagick."""
-        tool = shutil.which("magick") or shutil.which("convert")
+        tool = _which("magick") or _which("convert")
         cmd = [
             tool,
             "-density",
@@ -172,7 +484,7 @@ class FormatConverter:
         self, pdf_path: Path, out_path: Path, dpi: int, page: int
     ) -> Path:
         """Convert using Ghostscript."""
-        tool = shutil.which("gs")
+        tool = _which("gs")
         cmd = [
             tool,
             "-dSAFER",
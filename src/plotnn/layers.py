@@ -2,68 +2,171 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields
 from pathlib import Path
 
-from .compiler import FormatConverter, LaTeXCompiler
-from .renderer import DiagramRenderer
 from .templates import LaTeXTemplate, _layers_dir_path  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
 
+# The zero-argument wrappers are pure; cache their output for the process
+# lifetime so repeated document builds skip the template assembly entirely.
+@functools.lru_cache(maxsize=1)
 def to_head_pkg() -> str:
     return LaTeXTemplate.document_header_external()
 
 
+@functools.lru_cache(maxsize=1)
 def to_head_inline() -> str:
     return LaTeXTemplate.document_header_inline()
 
 
+@functools.lru_cache(maxsize=1)
 def to_colors() -> str:
     return LaTeXTemplate.color_definitions()
 
 
 def to_begin() -> str:
-    return LaTeXTemplate.document_begin()
+    return _BEGIN
 
 
 def to_end() -> str:
-    return LaTeXTemplate.document_end()
+    return _END
+
+
+# Constant begin/end markers: pure literals, safe to build once at import.
+_BEGIN = LaTeXTemplate.document_begin()
+_END = LaTeXTemplate.document_end()
+
+
+def _iter_document(
+    arch: Iterable[str], inline_styles: bool = True, include_colors: bool = True
+) -> Iterator[str]:
+    """Yield the document parts lazily so large archs never live twice in memory."""
+    if inline_styles:
+        yield to_head_inline()
+    else:
+        yield to_head_pkg()
+    if include_colors:
+        yield to_colors()
+    yield _BEGIN
+    yield from arch
+    yield _END
+
+
+def to_document_iter(
+    arch: Iterable[str], inline_styles: bool = True, include_colors: bool = True
+) -> Iterator[str]:
+    """Public generator counterpart of :func:`to_document` for streaming writers."""
+    return _iter_document(arch, inline_styles=inline_styles, include_colors=include_colors)
 
 
 def to_document(arch: list[str], inline_styles: bool = True, include_colors: bool = True) -> str:
-    return LaTeXTemplate.full_document(
-        arch, inline_styles=inline_styles, include_colors=include_colors
-    )
+    head = to_head_inline() if inline_styles else to_head_pkg()
+    colors = (to_colors(),) if include_colors else ()
+    # One flat tuple lets join size its output in a single pass.
+    return "".join((head, *colors, _BEGIN, *arch, _END))
 
 
 def to_generate(
-    arch: list[str],
+    arch: Iterable[str],
     pathname: str = "file.tex",
     inline_styles: bool = True,
     include_colors: bool = True,
 ) -> None:
-    DiagramRenderer().render_to_tex(
-        arch, pathname, inline_styles=inline_styles, include_colors=include_colors
-    )
+    Path(pathname).parent.mkdir(parents=True, exist_ok=True)
+    # Binary mode skips the TextIOWrapper encode/newline layer: each part is
+    # encoded once and handed straight to the buffered raw stream. 128 KiB of
+    # buffer keeps multi-MiB documents down to a handful of write syscalls.
+    with open(pathname, "wb", buffering=1 << 17) as f:
+        for part in _iter_document(arch, inline_styles=inline_styles, include_colors=include_colors):
+            f.write(part.encode("utf-8"))
+
+
+# Singleton compiler/converter accessors: construction probes the toolchain,
+# so share one instance per process instead of rebuilding it per call. The
+# imports stay lazy — building tex strings must not pay for the subprocess
+# machinery.
+@functools.lru_cache(maxsize=1)
+def _compiler():
+    from .compiler import LaTeXCompiler
+
+    return LaTeXCompiler()
+
+
+@functools.lru_cache(maxsize=1)
+def _converter():
+    from .compiler import FormatConverter
+
+    return FormatConverter()
 
 
 def compile_tex_to_pdf(
-    tex_content: str, out_pdf: str | Path, keep_tex: bool | str | Path = True
+    tex_content: str,
+    out_pdf: str | Path,
+    keep_tex: bool | str | Path = True,
+    use_cache: bool = True,
 ) -> Path:
-    compiler = LaTeXCompiler()
-    return compiler.compile_to_pdf(tex_content, out_pdf, keep_tex=keep_tex)
+    return _compiler().compile_to_pdf(tex_content, out_pdf, keep_tex=keep_tex, use_cache=use_cache)
 
 
 def pdf_to_format(
-    pdf_path: Path, out_path: Path, format: str, dpi: int = 300, page: int = 1
+    pdf_path: Path | None,
+    out_path: Path,
+    format: str,
+    dpi: int = 300,
+    page: int = 1,
+    pdf_bytes: bytes | None = None,
 ) -> Path:
-    converter = FormatConverter()
-    return converter.pdf_to_format(pdf_path, out_path, format, dpi=dpi, page=page)
+    return _converter().pdf_to_format(
+        pdf_path, out_path, format, dpi=dpi, page=page, pdf_bytes=pdf_bytes
+    )
+
+
+def _cached_builder(func):
+    """Memoize a snippet builder, tolerating unhashable arguments.
+
+    The builders are pure string formatters, so repeated calls with the same
+    arguments can reuse the cached snippet. Callers sometimes pass lists for
+    the multi-valued parameters (``n_filer``, ``width``); those cannot be
+    cache keys, so such calls fall back to formatting directly instead of
+    raising ``TypeError``.
+    """
+    cached = functools.lru_cache(maxsize=2048)(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except TypeError:
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=128)
+def _input_anchor_tail(name: str, width: int, height: int, anchor_scale: float) -> str:
+    """Coordinate anchors for an input node; identical for repeated geometries."""
+    # Format the half extents once; each is interpolated twice below.
+    half_w = str(width * anchor_scale)
+    half_h = str(height / 2)
+    center = f"({name}.center)"
+    return "".join(
+        (
+            f"\\coordinate ({name}-east) at (${center}+({half_w}cm,0,0)$);",
+            f"\\coordinate ({name}-west) at (${center}-({half_w}cm,0,0)$);",
+            f"\\coordinate ({name}-north) at (${center}+(0,{half_h}cm,0)$);",
+            f"\\coordinate ({name}-south) at (${center}-(0,{half_h}cm,0)$);",
+        )
+    )
 
 
+@_cached_builder
 def to_input(
     pathfile: str,
     to: str = "(-3,0,0)",
@@ -72,22 +175,391 @@ def to_input(
     name: str = "temp",
     anchor_scale: float = 0.01,
 ) -> str:
-    half_w = width * anchor_scale
-    half_h = height / 2
     return (
         f"\\node[canvas is zy plane at x=0] ({name}) at {to} "
         f"{{\\includegraphics[width={width}cm,height={height}cm]{{{pathfile}}}}};"
-        f"\\coordinate ({name}-east) at ($({name}.center)+({half_w}cm,0,0)$);"
-        f"\\coordinate ({name}-west) at ($({name}.center)-({half_w}cm,0,0)$);"
-        f"\\coordinate ({name}-north) at ($({name}.center)+(0,{half_h}cm,0)$);"
-        f"\\coordinate ({name}-south) at ($({name}.center)-(0,{half_h}cm,0)$);"
+        + _input_anchor_tail(name, width, height, anchor_scale)
     )
 
 
+# %-format templates for the shortest, most frequently called emitters:
+# a single C-level substitution beats rebuilding an f-string per call.
+_CONN_FMT = "\\draw [connection]  (%s-east)    -- node {\\midarrow} (%s-west);"
+
+_SUM_FMT = """\\pic[shift={%s}] at %s
+    {Ball={
+        name=%s,
+        fill=\\SumColor,
+        opacity=%s,
+        radius=%s,
+        logo=$+$
+        }
+    };"""
+
+_SKIP_FMT = """\\path (%(of)s-southeast) -- (%(of)s-northeast) coordinate[pos=%(pos)s] (%(of)s-top) ;
+\\path (%(to)s-south)  -- (%(to)s-north)  coordinate[pos=%(pos)s] (%(to)s-top) ;
+\\draw [copyconnection]  (%(of)s-northeast)
+-- node {\\copymidarrow}(%(of)s-top)
+-- node {\\copymidarrow}(%(to)s-top)
+-- node {\\copymidarrow} (%(to)s-north);"""
+
+
+# Precompiled templates for the box/ball builders: each literal is parsed
+# once at import instead of re-running f-string build ops per call. The
+# hottest builders use positional %-formatting — the cheapest small-string
+# substitution CPython offers — the rest keep named .format slots.
+_CONV_TMPL = """\\pic[shift={%s}] at %s
+    {Box={
+        name=%s,
+        caption=%s,
+        xlabel={{ %s, }},
+        zlabel=%s,
+        fill=\\ConvColor,
+        height=%s,
+        width=%s,
+        depth=%s
+        }
+    };"""
+
+_CONV_CONV_RELU_TMPL = """\\pic[shift={ %s }] at %s
+    {RightBandedBox={
+        name=%s,
+        caption=%s,
+        xlabel={ { %s }, { %s } },
+        zlabel=%s,
+        fill=\\ConvColor,
+        bandfill=\\ConvReluColor,
+        height=%s,
+        width={ %s , %s },
+        depth=%s
+        }
+    };"""
+
+_POOL_TMPL = """\\pic[shift={ %s }] at %s
+    {Box={
+        name=%s,
+        caption=%s,
+        fill=\\PoolColor,
+        opacity=%s,
+        height=%s,
+        width=%s,
+        depth=%s
+        }
+    };"""
+
+_UNPOOL_TMPL = """\\pic[shift={ %s }] at %s
+    {Box={
+        name=%s,
+        caption=%s,
+        fill=\\UnpoolColor,
+        opacity=%s,
+        height=%s,
+        width=%s,
+        depth=%s
+        }
+    };"""
+
+_CONV_RES_TMPL = """\\pic[shift={ %s }] at %s
+    {RightBandedBox={
+        name=%s,
+        caption=%s,
+        xlabel={ { %s }, },
+        zlabel=%s,
+        fill={rgb:white,1;black,3},
+        bandfill={rgb:white,1;black,2},
+        opacity=%s,
+        height=%s,
+        width=%s,
+        depth=%s
+        }
+    };"""
+
+_CONV_SOFTMAX_TMPL = """\\pic[shift={%s}] at %s
+    {Box={
+        name=%s,
+        caption=%s,
+        zlabel=%s,
+        fill=\\SoftmaxColor,
+        height=%s,
+        width=%s,
+        depth=%s
+        }
+    };"""
+
+_EMBEDDING_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {model_dim}, }}}},
+        zlabel={vocab_size},
+        fill=\\FcColor,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_POSITIONAL_ENCODING_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{RightBandedBox={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {model_dim} }}, {{ PE }} }},
+        zlabel={seq_len},
+        fill=\\FcColor,
+        bandfill=\\FcReluColor,
+        height={height},
+        width={{{width} , {width}}},
+        depth={depth}
+        }}
+    }};"""
+
+_MULTIHEAD_ATTENTION_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{RightBandedBox={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {model_dim} }}, {{ h={heads} }} }},
+        zlabel={model_dim},
+        fill=\\ConvColor,
+        bandfill=\\ConvReluColor,
+        height={height},
+        width={{{width} , {width}}},
+        depth={depth}
+        }}
+    }};"""
+
+_FEED_FORWARD_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{RightBandedBox={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {model_dim} }}, {{ {hidden_dim} }} }},
+        zlabel={model_dim},
+        fill=\\FcColor,
+        bandfill=\\FcReluColor,
+        height={height},
+        width={{{width} , {width}}},
+        depth={depth}
+        }}
+    }};"""
+
+_LAYER_NORM_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {model_dim}, }}}},
+        zlabel={model_dim},
+        fill=\\PoolColor,
+        opacity=0.4,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_ADD_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Ball={{
+        name={name},
+        fill=\\SumColor,
+        opacity=0.6,
+        radius={radius},
+        logo=$+$
+        }}
+    }};"""
+
+_OUTPUT_PROJECTION_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {vocab_size}, }}}},
+        zlabel={model_dim},
+        fill=\\SoftmaxColor,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_SOFTMAX_TMPL = """\\pic[shift={%s}] at %s
+    {Box={
+        name=%s,
+        caption=%s,
+        xlabel={ " " ,"dummy" },
+        zlabel=%s,
+        fill=\\SoftmaxColor,
+        opacity=%s,
+        height=%s,
+        width=%s,
+        depth=%s
+        }
+    };"""
+
+_ACTIVATION_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        fill=\\ActivationColor,
+        opacity=0.6,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_NORMALIZATION_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        fill=\\NormColor,
+        opacity=0.45,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_RNN_CELL_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{RightBandedBox={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {hidden_size} }}, {{ {cell} }} }},
+        zlabel={hidden_size},
+        fill=\\RNNColor,
+        bandfill=\\FcReluColor,
+        opacity=0.85,
+        height={height},
+        width={{ {width} , {width} }},
+        depth={depth}
+        }}
+    }};"""
+
+_GENERIC_BOX_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{{pic_type}={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {label_left} }}, {{ {label_right} }} }},
+        zlabel={zlabel},
+        fill={fill},
+        {extra}
+        opacity={opacity},
+        height={height},
+        width={width_tex},
+        depth={depth}
+        }}
+    }};"""
+
+_DEPTHWISE_CONV_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {channels}, }} }},
+        zlabel={kernel},
+        fill=\\DepthwiseColor,
+        opacity=0.85,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_SEPARABLE_CONV_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{RightBandedBox={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {in_channels} }}, {{ {out_channels} }} }},
+        zlabel=DW+PW,
+        fill=\\SepConvColor,
+        bandfill=\\DepthwiseColor,
+        opacity=0.9,
+        height={height},
+        width={{{width[0]} , {width[1]}}},
+        depth={depth}
+        }}
+    }};"""
+
+_TRANSPOSE_CONV_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {n_filer}, }}}},
+        zlabel={s_filer},
+        fill=\\TransposeConvColor,
+        opacity=0.85,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_FLATTEN_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Box={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {features}, }}}},
+        zlabel=feat,
+        fill=\\FlattenColor,
+        opacity=0.7,
+        height={height},
+        width={width},
+        depth={depth}
+        }}
+    }};"""
+
+_SQUEEZE_EXCITATION_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{RightBandedBox={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ {channels} }}, {{ {hidden} }} }},
+        zlabel=SE,
+        fill=\\SEColor,
+        bandfill=\\ActivationColor,
+        opacity=0.8,
+        height={height},
+        width={{{width} , {width}}},
+        depth={depth}
+        }}
+    }};"""
+
+_TRANSFORMER_BLOCK_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{RightBandedBox={{
+        name={name},
+        caption={caption},
+        xlabel={{{{ h={heads} }}, {{ {mlp_dim} }} }},
+        zlabel={model_dim},
+        fill=\\TransformerBlockColor,
+        bandfill=\\FcReluColor,
+        opacity=0.85,
+        height={height},
+        width={{{width[0]} , {width[1]}}},
+        depth={depth}
+        }}
+    }};"""
+
+_CONCAT_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Ball={{
+        name={name},
+        fill=\\OpColor,
+        opacity=0.55,
+        radius={radius},
+        logo=$\\parallel$
+        }}
+    }};"""
+
+_SPLIT_TMPL = """\\pic[shift={{{offset}}}] at {to}
+    {{Ball={{
+        name={name},
+        fill=\\OpColor,
+        opacity=0.55,
+        radius={radius},
+        logo=$\\bowtie$
+        }}
+    }};"""
+
+
+@_cached_builder
 def to_connection(of: str, to: str) -> str:
-    return f"\\draw [connection]  ({of}-east)    -- node {{\\midarrow}} ({to}-west);"
+    return _CONN_FMT % (of, to)
 
 
+@_cached_builder
 def to_conv(
     name: str,
     s_filer: int = 256,
@@ -99,20 +571,10 @@ def to_conv(
     depth: int = 40,
     caption: str = " ",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {n_filer}, }}}},
-        zlabel={s_filer},
-        fill=\\ConvColor,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _CONV_TMPL % (offset, to, name, caption, n_filer, s_filer, height, width, depth)
 
 
+@_cached_builder
 def to_conv_conv_relu(
     name: str,
     s_filer: int = 256,
@@ -124,21 +586,10 @@ def to_conv_conv_relu(
     depth: int = 40,
     caption: str = " ",
 ) -> str:
-    return f"""\\pic[shift={{ {offset} }}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{ {{ {n_filer[0]} }}, {{ {n_filer[1]} }} }},
-        zlabel={s_filer},
-        fill=\\ConvColor,
-        bandfill=\\ConvReluColor,
-        height={height},
-        width={{ {width[0]} , {width[1]} }},
-        depth={depth}
-        }}
-    }};"""
+    return _CONV_CONV_RELU_TMPL % (offset, to, name, caption, n_filer[0], n_filer[1], s_filer, height, width[0], width[1], depth)
 
 
+@_cached_builder
 def to_pool(
     name: str,
     offset: str = "(0,0,0)",
@@ -149,19 +600,10 @@ def to_pool(
     opacity: float = 0.5,
     caption: str = " ",
 ) -> str:
-    return f"""\\pic[shift={{ {offset} }}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        fill=\\PoolColor,
-        opacity={opacity},
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _POOL_TMPL % (offset, to, name, caption, opacity, height, width, depth)
 
 
+@_cached_builder
 def to_unpool(
     name: str,
     offset: str = "(0,0,0)",
@@ -172,19 +614,10 @@ def to_unpool(
     opacity: float = 0.5,
     caption: str = " ",
 ) -> str:
-    return f"""\\pic[shift={{ {offset} }}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        fill=\\UnpoolColor,
-        opacity={opacity},
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _UNPOOL_TMPL % (offset, to, name, caption, opacity, height, width, depth)
 
 
+@_cached_builder
 def to_conv_res(
     name: str,
     s_filer: int = 256,
@@ -197,22 +630,10 @@ def to_conv_res(
     opacity: float = 0.2,
     caption: str = " ",
 ) -> str:
-    return f"""\\pic[shift={{ {offset} }}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{ {{ {n_filer} }}, }},
-        zlabel={s_filer},
-        fill={{rgb:white,1;black,3}},
-        bandfill={{rgb:white,1;black,2}},
-        opacity={opacity},
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _CONV_RES_TMPL % (offset, to, name, caption, n_filer, s_filer, opacity, height, width, depth)
 
 
+@_cached_builder
 def to_conv_softmax(
     name: str,
     s_filer: int = 40,
@@ -222,18 +643,8 @@ def to_conv_softmax(
     height: int = 40,
     depth: int = 40,
     caption: str = " ",
-) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        zlabel={s_filer},
-        fill=\\SoftmaxColor,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+) -> str:
+    return _CONV_SOFTMAX_TMPL % (offset, to, name, caption, s_filer, height, width, depth)
 
 
 # ---------------- Transformer specific helpers -----------------
@@ -248,18 +659,7 @@ def to_embedding(
     depth: int = 30,
     caption: str = "Embed",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {model_dim}, }}}},
-        zlabel={vocab_size},
-        fill=\\FcColor,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _EMBEDDING_TMPL.format(offset=offset, to=to, name=name, caption=caption, model_dim=model_dim, vocab_size=vocab_size, height=height, width=width, depth=depth)
 
 
 def to_positional_encoding(
@@ -273,19 +673,7 @@ def to_positional_encoding(
     depth: int = 30,
     caption: str = "PosEnc",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {model_dim} }}, {{ PE }} }},
-        zlabel={seq_len},
-        fill=\\FcColor,
-        bandfill=\\FcReluColor,
-        height={height},
-        width={{{width} , {width}}},
-        depth={depth}
-        }}
-    }};"""
+    return _POSITIONAL_ENCODING_TMPL.format(offset=offset, to=to, name=name, caption=caption, model_dim=model_dim, seq_len=seq_len, height=height, width=width, depth=depth)
 
 
 def to_multihead_attention(
@@ -299,19 +687,7 @@ def to_multihead_attention(
     depth: int = 28,
     caption: str = "MHA",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {model_dim} }}, {{ h={heads} }} }},
-        zlabel={model_dim},
-        fill=\\ConvColor,
-        bandfill=\\ConvReluColor,
-        height={height},
-        width={{{width} , {width}}},
-        depth={depth}
-        }}
-    }};"""
+    return _MULTIHEAD_ATTENTION_TMPL.format(offset=offset, to=to, name=name, caption=caption, model_dim=model_dim, heads=heads, height=height, width=width, depth=depth)
 
 
 def to_feed_forward(
@@ -325,19 +701,7 @@ def to_feed_forward(
     depth: int = 26,
     caption: str = "FFN",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {model_dim} }}, {{ {hidden_dim} }} }},
-        zlabel={model_dim},
-        fill=\\FcColor,
-        bandfill=\\FcReluColor,
-        height={height},
-        width={{{width} , {width}}},
-        depth={depth}
-        }}
-    }};"""
+    return _FEED_FORWARD_TMPL.format(offset=offset, to=to, name=name, caption=caption, model_dim=model_dim, hidden_dim=hidden_dim, height=height, width=width, depth=depth)
 
 
 def to_layer_norm(
@@ -350,19 +714,7 @@ def to_layer_norm(
     depth: int = 20,
     caption: str = "LN",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {model_dim}, }}}},
-        zlabel={model_dim},
-        fill=\\PoolColor,
-        opacity=0.4,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _LAYER_NORM_TMPL.format(offset=offset, to=to, name=name, caption=caption, model_dim=model_dim, height=height, width=width, depth=depth)
 
 
 def to_add(
@@ -373,15 +725,7 @@ def to_add(
     caption: str = "+",
 ) -> str:
     # Reaproveita estilo Ball, mas podemos alterar no futuro
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Ball={{
-        name={name},
-        fill=\\SumColor,
-        opacity=0.6,
-        radius={radius},
-        logo=$+$
-        }}
-    }};"""
+    return _ADD_TMPL.format(offset=offset, to=to, name=name, radius=radius)
 
 
 def to_output_projection(
@@ -395,20 +739,10 @@ def to_output_projection(
     depth: int = 28,
     caption: str = "Proj",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {vocab_size}, }}}},
-        zlabel={model_dim},
-        fill=\\SoftmaxColor,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _OUTPUT_PROJECTION_TMPL.format(offset=offset, to=to, name=name, caption=caption, vocab_size=vocab_size, model_dim=model_dim, height=height, width=width, depth=depth)
 
 
+@_cached_builder
 def to_softmax(
     name: str,
     s_filer: int = 10,
@@ -420,21 +754,10 @@ def to_softmax(
     opacity: float = 0.8,
     caption: str = " ",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{ " " ,"dummy" }},
-        zlabel={s_filer},
-        fill=\\SoftmaxColor,
-        opacity={opacity},
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _SOFTMAX_TMPL % (offset, to, name, caption, s_filer, opacity, height, width, depth)
 
 
+@_cached_builder
 def to_sum(
     name: str,
     offset: str = "(0,0,0)",
@@ -442,15 +765,7 @@ def to_sum(
     radius: float = 2.5,
     opacity: float = 0.6,
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Ball={{
-        name={name},
-        fill=\\SumColor,
-        opacity={opacity},
-        radius={radius},
-        logo=$+$
-        }}
-    }};"""
+    return _SUM_FMT % (offset, to, name, opacity, radius)
 
 
 # --------- Generic / Extended operations for broader model coverage ---------
@@ -465,17 +780,7 @@ def to_activation(
     caption: str | None = None,
 ) -> str:
     caption = caption or act
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        fill=\\ActivationColor,
-        opacity=0.6,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _ACTIVATION_TMPL.format(offset=offset, to=to, name=name, caption=caption, height=height, width=width, depth=depth)
 
 
 def to_normalization(
@@ -489,17 +794,7 @@ def to_normalization(
     caption: str | None = None,
 ) -> str:
     caption = caption or kind
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        fill=\\NormColor,
-        opacity=0.45,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _NORMALIZATION_TMPL.format(offset=offset, to=to, name=name, caption=caption, height=height, width=width, depth=depth)
 
 
 def to_rnn_cell(
@@ -514,20 +809,7 @@ def to_rnn_cell(
     caption: str | None = None,
 ) -> str:
     caption = caption or f"{cell}"
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {hidden_size} }}, {{ {cell} }} }},
-        zlabel={hidden_size},
-        fill=\\RNNColor,
-        bandfill=\\FcReluColor,
-        opacity=0.85,
-        height={height},
-        width={{ {width} , {width} }},
-        depth={depth}
-        }}
-    }};"""
+    return _RNN_CELL_TMPL.format(offset=offset, to=to, name=name, caption=caption, hidden_size=hidden_size, cell=cell, height=height, width=width, depth=depth)
 
 
 def to_generic_box(
@@ -552,20 +834,7 @@ def to_generic_box(
         width_tex = str(width)
         pic_type = "Box"
         extra = ""
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{{pic_type}={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {label_left} }}, {{ {label_right} }} }},
-        zlabel={zlabel},
-        fill={fill},
-        {extra}
-        opacity={opacity},
-        height={height},
-        width={width_tex},
-        depth={depth}
-        }}
-    }};"""
+    return _GENERIC_BOX_TMPL.format(offset=offset, to=to, pic_type=pic_type, name=name, caption=caption, label_left=label_left, label_right=label_right, zlabel=zlabel, fill=fill, extra=extra, opacity=opacity, height=height, width_tex=width_tex, depth=depth)
 
 
 # -------- New extended layer primitives ---------
@@ -580,19 +849,7 @@ def to_depthwise_conv(
     depth: int = 30,
     caption: str = "DW",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {channels}, }} }},
-        zlabel={kernel},
-        fill=\\DepthwiseColor,
-        opacity=0.85,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _DEPTHWISE_CONV_TMPL.format(offset=offset, to=to, name=name, caption=caption, channels=channels, kernel=kernel, height=height, width=width, depth=depth)
 
 
 def to_separable_conv(
@@ -606,20 +863,7 @@ def to_separable_conv(
     depth: int = 30,
     caption: str = "SepConv",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {in_channels} }}, {{ {out_channels} }} }},
-        zlabel=DW+PW,
-        fill=\\SepConvColor,
-        bandfill=\\DepthwiseColor,
-        opacity=0.9,
-        height={height},
-        width={{{width[0]} , {width[1]}}},
-        depth={depth}
-        }}
-    }};"""
+    return _SEPARABLE_CONV_TMPL.format(offset=offset, to=to, name=name, caption=caption, in_channels=in_channels, out_channels=out_channels, height=height, width=width, depth=depth)
 
 
 def to_transpose_conv(
@@ -633,19 +877,7 @@ def to_transpose_conv(
     depth: int = 30,
     caption: str = "DeConv",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {n_filer}, }}}},
-        zlabel={s_filer},
-        fill=\\TransposeConvColor,
-        opacity=0.85,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _TRANSPOSE_CONV_TMPL.format(offset=offset, to=to, name=name, caption=caption, n_filer=n_filer, s_filer=s_filer, height=height, width=width, depth=depth)
 
 
 def to_flatten(
@@ -658,19 +890,7 @@ def to_flatten(
     depth: int = 12,
     caption: str = "Flatten",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Box={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {features}, }}}},
-        zlabel=feat,
-        fill=\\FlattenColor,
-        opacity=0.7,
-        height={height},
-        width={width},
-        depth={depth}
-        }}
-    }};"""
+    return _FLATTEN_TMPL.format(offset=offset, to=to, name=name, caption=caption, features=features, height=height, width=width, depth=depth)
 
 
 def to_squeeze_excitation(
@@ -685,20 +905,7 @@ def to_squeeze_excitation(
     caption: str = "SE",
 ) -> str:
     hidden = int(channels * se_ratio)
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ {channels} }}, {{ {hidden} }} }},
-        zlabel=SE,
-        fill=\\SEColor,
-        bandfill=\\ActivationColor,
-        opacity=0.8,
-        height={height},
-        width={{{width} , {width}}},
-        depth={depth}
-        }}
-    }};"""
+    return _SQUEEZE_EXCITATION_TMPL.format(offset=offset, to=to, name=name, caption=caption, channels=channels, hidden=hidden, height=height, width=width, depth=depth)
 
 
 def to_transformer_block(
@@ -713,20 +920,7 @@ def to_transformer_block(
     depth: int = 34,
     caption: str = "Block",
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{RightBandedBox={{
-        name={name},
-        caption={caption},
-        xlabel={{{{ h={heads} }}, {{ {mlp_dim} }} }},
-        zlabel={model_dim},
-        fill=\\TransformerBlockColor,
-        bandfill=\\FcReluColor,
-        opacity=0.85,
-        height={height},
-        width={{{width[0]} , {width[1]}}},
-        depth={depth}
-        }}
-    }};"""
+    return _TRANSFORMER_BLOCK_TMPL.format(offset=offset, to=to, name=name, caption=caption, heads=heads, mlp_dim=mlp_dim, model_dim=model_dim, height=height, width=width, depth=depth)
 
 
 def to_concat(
@@ -735,15 +929,7 @@ def to_concat(
     to: str = "(0,0,0)",
     radius: float = 2.2,
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Ball={{
-        name={name},
-        fill=\\OpColor,
-        opacity=0.55,
-        radius={radius},
-        logo=$\\parallel$
-        }}
-    }};"""
+    return _CONCAT_TMPL.format(offset=offset, to=to, name=name, radius=radius)
 
 
 def to_split(
@@ -752,24 +938,171 @@ def to_split(
     to: str = "(0,0,0)",
     radius: float = 2.2,
 ) -> str:
-    return f"""\\pic[shift={{{offset}}}] at {to}
-    {{Ball={{
-        name={name},
-        fill=\\OpColor,
-        opacity=0.55,
-        radius={radius},
-        logo=$\\bowtie$
-        }}
-    }};"""
+    return _SPLIT_TMPL.format(offset=offset, to=to, name=name, radius=radius)
 
 
+@_cached_builder
 def to_skip(of: str, to: str, pos: float = 1.25) -> str:
-    return f"""\\path ({of}-southeast) -- ({of}-northeast) coordinate[pos={pos}] ({of}-top) ;
-\\path ({to}-south)  -- ({to}-north)  coordinate[pos={pos}] ({to}-top) ;
-\\draw [copyconnection]  ({of}-northeast)
--- node {{\\copymidarrow}}({of}-top)
--- node {{\\copymidarrow}}({to}-top)
--- node {{\\copymidarrow}} ({to}-north);"""
+    return _SKIP_FMT % {"of": of, "to": to, "pos": pos}
+
+
+# --------- Frozen layer specs (compact, hashable layer records) ---------
+# Slots-backed frozen dataclasses cost far less memory than kwargs dicts and
+# hash cheaply, so arch lists can be held as specs and stringified lazily.
+# Formatting stays centralized in the memoized to_* builders.
+
+
+@dataclass(slots=True, frozen=True)
+class ConvSpec:
+    name: str
+    s_filer: int = 256
+    n_filer: int = 64
+    offset: str = "(0,0,0)"
+    to: str = "(0,0,0)"
+    width: int = 1
+    height: int = 40
+    depth: int = 40
+    caption: str = " "
+
+    def __str__(self) -> str:
+        return to_conv(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+@dataclass(slots=True, frozen=True)
+class ConvConvReluSpec:
+    name: str
+    s_filer: int = 256
+    n_filer: tuple[int, int] = (64, 64)
+    offset: str = "(0,0,0)"
+    to: str = "(0,0,0)"
+    width: tuple[int, int] = (2, 2)
+    height: int = 40
+    depth: int = 40
+    caption: str = " "
+
+    def __str__(self) -> str:
+        return to_conv_conv_relu(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+@dataclass(slots=True, frozen=True)
+class PoolSpec:
+    name: str
+    offset: str = "(0,0,0)"
+    to: str = "(0,0,0)"
+    width: int = 1
+    height: int = 32
+    depth: int = 32
+    opacity: float = 0.5
+    caption: str = " "
+
+    def __str__(self) -> str:
+        return to_pool(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+@dataclass(slots=True, frozen=True)
+class UnPoolSpec:
+    name: str
+    offset: str = "(0,0,0)"
+    to: str = "(0,0,0)"
+    width: int = 1
+    height: int = 32
+    depth: int = 32
+    opacity: float = 0.5
+    caption: str = " "
+
+    def __str__(self) -> str:
+        return to_unpool(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+@dataclass(slots=True, frozen=True)
+class ConnectionSpec:
+    of: str
+    to: str
+
+    def __str__(self) -> str:
+        return to_connection(self.of, self.to)
+
+
+@dataclass(slots=True, frozen=True)
+class SkipSpec:
+    of: str
+    to: str
+    pos: float = 1.25
+
+    def __str__(self) -> str:
+        return to_skip(self.of, self.to, pos=self.pos)
+
+
+@dataclass(slots=True, frozen=True)
+class SumSpec:
+    name: str
+    offset: str = "(0,0,0)"
+    to: str = "(0,0,0)"
+    radius: float = 2.5
+    opacity: float = 0.6
+
+    def __str__(self) -> str:
+        return to_sum(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+# Dispatch table mapping layer kinds to their builder functions.
+_DISPATCH = {
+    "input": to_input,
+    "connection": to_connection,
+    "conv": to_conv,
+    "conv_conv_relu": to_conv_conv_relu,
+    "pool": to_pool,
+    "unpool": to_unpool,
+    "conv_res": to_conv_res,
+    "conv_softmax": to_conv_softmax,
+    "embedding": to_embedding,
+    "positional_encoding": to_positional_encoding,
+    "multihead_attention": to_multihead_attention,
+    "feed_forward": to_feed_forward,
+    "layer_norm": to_layer_norm,
+    "add": to_add,
+    "output_projection": to_output_projection,
+    "softmax": to_softmax,
+    "sum": to_sum,
+    "activation": to_activation,
+    "normalization": to_normalization,
+    "rnn_cell": to_rnn_cell,
+    "generic_box": to_generic_box,
+    "depthwise_conv": to_depthwise_conv,
+    "separable_conv": to_separable_conv,
+    "transpose_conv": to_transpose_conv,
+    "flatten": to_flatten,
+    "squeeze_excitation": to_squeeze_excitation,
+    "transformer_block": to_transformer_block,
+    "concat": to_concat,
+    "split": to_split,
+    "skip": to_skip,
+}
+
+
+def render_arch(spec: Iterable[tuple[str, dict]]) -> Iterator[str]:
+    """Lazily render structured layer descriptors into LaTeX snippets.
+
+    Each descriptor is a ``(kind, kwargs)`` tuple dispatched to the matching
+    ``to_*`` builder. The result is a generator, so it can feed the streaming
+    writer in :func:`to_generate` without materializing the whole arch list.
+    """
+    for kind, kwargs in spec:
+        try:
+            builder = _DISPATCH[kind]
+        except KeyError:
+            raise ValueError(f"Unknown layer kind: {kind!r}") from None
+        yield builder(**kwargs)
+
+
+def _resolve_out(path: str | Path) -> Path:
+    """Absolutize an output path, skipping resolve() when already absolute.
+
+    Path.resolve walks realpath (one stat per component); in tight export
+    loops callers usually pass absolute paths, which need no syscalls at all.
+    """
+    p = Path(path)
+    return p if p.is_absolute() else p.resolve()
 
 
 def generate_pdf(
@@ -778,9 +1111,10 @@ def generate_pdf(
     inline_styles: bool = True,
     include_colors: bool = True,
     keep_tex: bool | str | Path = True,
+    use_cache: bool = True,
 ) -> Path:
     doc = to_document(arch, inline_styles=inline_styles, include_colors=include_colors)
-    return compile_tex_to_pdf(doc, out_pdf, keep_tex=keep_tex)
+    return compile_tex_to_pdf(doc, out_pdf, keep_tex=keep_tex, use_cache=use_cache)
 
 
 def generate_png(
@@ -791,18 +1125,13 @@ def generate_png(
     include_colors: bool = True,
     keep_tex: bool | str | Path = True,
 ) -> Path:
-    out_png_path = Path(out_png).resolve()
+    out_png_path = _resolve_out(out_png)
     if keep_tex is False:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            pdf_tmp = Path(tmpdir) / "temp.pdf"
-            generate_pdf(
-                arch,
-                pdf_tmp,
-                inline_styles=inline_styles,
-                include_colors=include_colors,
-                keep_tex=False,
-            )
-            return pdf_to_format(pdf_tmp, out_png_path, "png", dpi=dpi)
+        doc = to_document(arch, inline_styles=inline_styles, include_colors=include_colors)
+        # The PDF is transient here: hand its bytes straight to the converter
+        # rather than parking it on disk only to read it back and delete it.
+        pdf_bytes = _compiler().compile_to_bytes(doc)
+        return pdf_to_format(None, out_png_path, "png", dpi=dpi, pdf_bytes=pdf_bytes)
     pdf_path = out_png_path.with_suffix(".pdf")
     generate_pdf(
         arch,
@@ -821,18 +1150,11 @@ def generate_svg(
     include_colors: bool = True,
     keep_tex: bool | str | Path = True,
 ) -> Path:
-    out_svg_path = Path(out_svg).resolve()
+    out_svg_path = _resolve_out(out_svg)
     if keep_tex is False:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            pdf_tmp = Path(tmpdir) / "temp.pdf"
-            generate_pdf(
-                arch,
-                pdf_tmp,
-                inline_styles=inline_styles,
-                include_colors=include_colors,
-                keep_tex=False,
-            )
-            return pdf_to_format(pdf_tmp, out_svg_path, "svg")
+        doc = to_document(arch, inline_styles=inline_styles, include_colors=include_colors)
+        pdf_bytes = _compiler().compile_to_bytes(doc)
+        return pdf_to_format(None, out_svg_path, "svg", pdf_bytes=pdf_bytes)
     pdf_path = out_svg_path.with_suffix(".pdf")
     generate_pdf(
         arch,
@@ -842,3 +1164,92 @@ def generate_svg(
         keep_tex=keep_tex,
     )
     return pdf_to_format(pdf_path, out_svg_path, "svg")
+
+
+def generate_formats(
+    arch: list[str],
+    out_paths: dict[str, str | Path],
+    dpi: int = 300,
+    inline_styles: bool = True,
+    include_colors: bool = True,
+    keep_tex: bool | str | Path = True,
+) -> dict[str, Path]:
+    """Export one architecture to several formats with a single LaTeX compile.
+
+    ``out_paths`` maps format names ("pdf", "png", "svg") to destinations.
+    The expensive pdflatex step runs once; every raster/vector conversion
+    reuses the same PDF.
+    """
+    unknown = set(out_paths) - {"pdf", "png", "svg"}
+    if unknown:
+        raise ValueError(f"Unknown formats: {sorted(unknown)}")
+
+    results: dict[str, Path] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if "pdf" in out_paths:
+            pdf_path = _resolve_out(out_paths["pdf"])
+        else:
+            pdf_path = Path(tmpdir) / "diagram.pdf"
+        generate_pdf(
+            arch,
+            pdf_path,
+            inline_styles=inline_styles,
+            include_colors=include_colors,
+            keep_tex=keep_tex if "pdf" in out_paths else False,
+        )
+        if "pdf" in out_paths:
+            results["pdf"] = pdf_path
+        for fmt in ("png", "svg"):
+            if fmt in out_paths:
+                out = _resolve_out(out_paths[fmt])
+                results[fmt] = pdf_to_format(pdf_path, out, fmt, dpi=dpi)
+    return results
+
+
+_BATCH_GENERATORS = {
+    "pdf": generate_pdf,
+    "png": generate_png,
+    "svg": generate_svg,
+}
+
+
+def generate_batch(
+    archs: list[list[str]],
+    outs: list[str | Path],
+    format: str = "pdf",
+    max_workers: int | None = None,
+    inline_styles: bool = True,
+    include_colors: bool = True,
+    keep_tex: bool | str | Path = True,
+) -> list[Path]:
+    """Render several architectures concurrently with a process pool.
+
+    Each LaTeX compile is an independent single-threaded subprocess, so
+    dispatching them across ``max_workers`` processes (default: CPU count)
+    scales roughly linearly with core count for multi-diagram sweeps.
+    """
+    import concurrent.futures
+
+    if len(archs) != len(outs):
+        raise ValueError("archs and outs must have the same length")
+    try:
+        generator = _BATCH_GENERATORS[format]
+    except KeyError:
+        raise ValueError("Format must be 'pdf', 'png' or 'svg'") from None
+
+    results: list[Path | None] = [None] * len(archs)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                generator,
+                arch,
+                out,
+                inline_styles=inline_styles,
+                include_colors=include_colors,
+                keep_tex=keep_tex,
+            ): i
+            for i, (arch, out) in enumerate(zip(archs, outs))
+        }
+        for fut in concurrent.futures.as_completed(futures):
+            results[futures[fut]] = fut.result()
+    return results  # type: ignore[return-value]
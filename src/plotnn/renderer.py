@@ -2,37 +2,126 @@
 
 from __future__ import annotations
 
+from functools import cached_property
+from itertools import chain
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from .compiler import FormatConverter, LaTeXCompiler
-from .templates import LaTeXTemplate
+from .templates import LaTeXTemplate, _preamble
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from .blocks import Element
+    from .compiler import FormatConverter, LaTeXCompiler
+
+
+def _render_job(
+    elements: list[Element] | list[str],
+    output_path: str | Path,
+    format: str,
+    inline_styles: bool,
+    include_colors: bool,
+) -> Path:
+    """Worker entry point for :meth:`DiagramRenderer.render_many`.
+
+    Module-level so it pickles across process boundaries; each worker builds
+    its own renderer (and thus its own toolchain probe) once.
+    """
+    renderer = DiagramRenderer()
+    if format == "pdf":
+        return renderer.render_to_pdf(
+            elements,
+            output_path,
+            inline_styles=inline_styles,
+            include_colors=include_colors,
+            keep_tex=False,
+        )
+    out = renderer.render(
+        elements,
+        {format: output_path},
+        inline_styles=inline_styles,
+        include_colors=include_colors,
+    )
+    return out[format]
 
 
 class DiagramRenderer:
     """High-level interface for rendering neural network diagrams."""
 
-    def __init__(self):
-        self.latex_compiler = LaTeXCompiler()
-        self.format_converter = FormatConverter()
+    def __init__(self, out_dir: str | Path | None = None, cache_dir: str | Path | None = None):
+        """Optionally anchor all relative output paths under ``out_dir``.
+
+        The directory is resolved and created once here, so per-render calls
+        skip the stat-per-component cost of resolve()/mkdir(parents=True).
+        ``cache_dir`` relocates the content-addressed PDF cache for this
+        renderer's compiles (default: the shared per-user cache).
+        """
+        self._cache_dir = cache_dir
+        self._out_dir: Path | None = None
+        if out_dir is not None:
+            self._out_dir = Path(out_dir).resolve()
+            self._out_dir.mkdir(parents=True, exist_ok=True)
+        # Directories already known to exist; avoids re-running mkdir for
+        # every file rendered into the same tree.
+        self._ensured_dirs: set[Path] = set()
+        # Lazily created scratch dir shared by this renderer's transient
+        # compiles; removed at interpreter exit.
+        self._scratch: Path | None = None
+
+    @cached_property
+    def latex_compiler(self) -> LaTeXCompiler:
+        """Compiler built on first use; tex-only callers never probe the toolchain."""
+        from .compiler import LaTeXCompiler
+
+        return LaTeXCompiler(cache_dir=self._cache_dir)
+
+    @cached_property
+    def format_converter(self) -> FormatConverter:
+        from .compiler import FormatConverter
+
+        return FormatConverter()
+
+    def _scratch_dir(self) -> Path:
+        """One reusable scratch directory per renderer instead of a fresh
+        TemporaryDirectory per compile."""
+        if self._scratch is None:
+            import atexit
+            import shutil
+            import tempfile
+
+            self._scratch = Path(tempfile.mkdtemp(prefix="plotnn-"))
+            atexit.register(shutil.rmtree, self._scratch, ignore_errors=True)
+        return self._scratch
+
+    def _prepare_output(self, output_path: str | Path) -> Path:
+        """Anchor ``output_path`` and make sure its parent directory exists."""
+        path = Path(output_path)
+        if self._out_dir is not None and not path.is_absolute():
+            path = self._out_dir / path
+        parent = path.parent
+        if parent not in self._ensured_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(parent)
+        return path
+
+    def _elements_to_latex(self, elements: list[Element] | list[str]) -> Iterable[str]:
+        """Convert elements to an iterable of LaTeX strings.
 
-    def _elements_to_latex(self, elements: list[Element] | list[str]) -> list[str]:
-        """Convert elements to LaTeX strings."""
+        Built elements are flattened lazily with chain.from_iterable, so the
+        parts flow straight into the consuming join/writelines without an
+        intermediate list being grown along the way.
+        """
         if not elements:
-            return []
+            return ()
 
         # Check if first element is a string or has build method
         if isinstance(elements[0], str):
             return elements  # type: ignore
 
-        # Elements have build method
-        latex_parts = []
-        for element in elements:
-            latex_parts.extend(element.build())  # type: ignore
-        return latex_parts
+        # Elements have build method; cached_build memoizes it so rendering
+        # the same elements to tex, pdf and png builds the snippets once.
+        return chain.from_iterable(element.cached_build() for element in elements)  # type: ignore
 
     def render_to_tex(
         self,
@@ -41,18 +130,21 @@ class DiagramRenderer:
         inline_styles: bool = True,
         include_colors: bool = True,
     ) -> Path:
-        """Render diagram elements to LaTeX file."""
-        latex_parts = self._elements_to_latex(elements)
+        """Render diagram elements to LaTeX file.
 
-        # Generate full document
-        document = LaTeXTemplate.full_document(
-            latex_parts, inline_styles=inline_styles, include_colors=include_colors
-        )
+        The document is streamed part by part through a large write buffer,
+        so peak memory stays at one snippet rather than the whole file.
+        Binary mode skips the TextIOWrapper layer: each part is encoded once
+        and handed straight to the buffered raw stream.
+        """
+        latex_parts = self._elements_to_latex(elements)
 
-        # Write to file
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(document, encoding="utf-8")
+        output_path = self._prepare_output(output_path)
+        with open(output_path, "wb", buffering=1 << 17) as f:
+            f.write(_preamble(inline_styles, include_colors).encode("utf-8"))
+            for part in latex_parts:
+                f.write(part.encode("utf-8"))
+            f.write(LaTeXTemplate.document_end().encode("utf-8"))
 
         return output_path
 
@@ -63,10 +155,11 @@ class DiagramRenderer:
         inline_styles: bool = True,
         include_colors: bool = True,
         keep_tex: bool | str | Path = True,
+        use_cache: bool = True,
     ) -> Path:
         """Render diagram elements to PDF file.
 
-        keep_tex segue a mesma semântica de LaTeXCompiler.compile_to_pdf.
+        keep_tex e use_cache seguem a mesma semântica de LaTeXCompiler.compile_to_pdf.
         """
         latex_parts = self._elements_to_latex(elements)
 
@@ -76,4 +169,125 @@ class DiagramRenderer:
         )
 
         # Compile to PDF
-        return self.latex_compiler.compile_to_pdf(document, output_path, keep_tex=keep_tex)
+        return self.latex_compiler.compile_to_pdf(
+            document, self._prepare_output(output_path), keep_tex=keep_tex, use_cache=use_cache
+        )
+
+    def render(
+        self,
+        elements: list[Element] | list[str],
+        outputs: dict[str, str | Path],
+        dpi: int = 300,
+        inline_styles: bool = True,
+        include_colors: bool = True,
+        keep_tex: bool | str | Path = False,
+    ) -> dict[str, Path]:
+        """Render one diagram to several formats with a single LaTeX compile.
+
+        ``outputs`` maps format names ("pdf", "png", "svg") to destinations.
+        The document is compiled once; raster/vector conversions all reuse
+        that PDF, so asking for PNG and SVG together costs one pdflatex run
+        instead of two.
+        """
+        unknown = set(outputs) - {"pdf", "png", "svg"}
+        if unknown:
+            raise ValueError(f"Unknown formats: {sorted(unknown)}")
+
+        document = LaTeXTemplate.full_document(
+            self._elements_to_latex(elements),
+            inline_styles=inline_styles,
+            include_colors=include_colors,
+        )
+
+        results: dict[str, Path] = {}
+        pdf_bytes: bytes | None = None
+        if "pdf" in outputs:
+            results["pdf"] = self.latex_compiler.compile_to_pdf(
+                document, self._prepare_output(outputs["pdf"]), keep_tex=keep_tex
+            )
+        elif outputs:
+            # No PDF destination requested: keep the intermediate in memory.
+            pdf_bytes = self.latex_compiler.compile_to_bytes(
+                document, work_dir=self._scratch_dir()
+            )
+        for fmt in ("png", "svg"):
+            if fmt in outputs:
+                results[fmt] = self.format_converter.pdf_to_format(
+                    results.get("pdf"),
+                    self._prepare_output(outputs[fmt]),
+                    fmt,
+                    dpi=dpi,
+                    pdf_bytes=pdf_bytes,
+                )
+        return results
+
+    def render_to_png(
+        self,
+        elements: list[Element] | list[str],
+        output_path: str | Path,
+        dpi: int = 300,
+        inline_styles: bool = True,
+        include_colors: bool = True,
+    ) -> Path:
+        """Render diagram elements straight to a PNG file."""
+        out = self.render(
+            elements,
+            {"png": output_path},
+            dpi=dpi,
+            inline_styles=inline_styles,
+            include_colors=include_colors,
+        )
+        return out["png"]
+
+    def render_to_svg(
+        self,
+        elements: list[Element] | list[str],
+        output_path: str | Path,
+        inline_styles: bool = True,
+        include_colors: bool = True,
+    ) -> Path:
+        """Render diagram elements straight to an SVG file."""
+        out = self.render(
+            elements,
+            {"svg": output_path},
+            inline_styles=inline_styles,
+            include_colors=include_colors,
+        )
+        return out["svg"]
+
+    def render_many(
+        self,
+        jobs: list[tuple[list[Element] | list[str], str | Path]],
+        format: str = "pdf",
+        max_workers: int | None = None,
+        inline_styles: bool = True,
+        include_colors: bool = True,
+    ) -> list[Path]:
+        """Render several diagrams concurrently with a process pool.
+
+        ``jobs`` pairs element lists with output paths. Each LaTeX compile is
+        an independent single-threaded subprocess, so spreading them over
+        ``max_workers`` processes (default: CPU count) scales roughly linearly
+        for multi-diagram sweeps; results come back in job order.
+        """
+        import concurrent.futures
+
+        if format not in ("pdf", "png", "svg"):
+            raise ValueError("Format must be 'pdf', 'png' or 'svg'")
+
+        results: list[Path | None] = [None] * len(jobs)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(
+                    _render_job,
+                    elements,
+                    output_path,
+                    format,
+                    inline_styles,
+                    include_colors,
+                ): i
+                for i, (elements, output_path) in enumerate(jobs)
+            }
+            for fut in concurrent.futures.as_completed(futures):
+                results[futures[fut]] = fut.result()
+        return results  # type: ignore[return-value]
@@ -2,35 +2,60 @@
 
 from __future__ import annotations
 
+import functools
+import re
+from collections.abc import Iterable
+from importlib import resources
+from itertools import chain
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=1)
 def _layers_dir_path() -> str:
-    """Get the path to the layers directory."""
-    path = Path(__file__).parent / "layers"
+    """Get the path to the layers directory (resolved once per process).
+
+    \\subimport needs a real on-disk directory, so this only works for
+    filesystem installs; zip/wheel-without-extraction users should render
+    with inline styles, where everything goes through importlib.resources.
+    """
+    res = resources.files(__package__).joinpath("layers")
+    path = res if isinstance(res, Path) else Path(__file__).parent / "layers"
     return str(path.resolve()).replace("\\", "/")
 
 
 def _read_pkg_text(*rel_parts: str) -> str:
-    """Read text from a package file."""
-    p = Path(__file__).parent.joinpath(*rel_parts)
-    return p.read_text(encoding="utf-8")
+    """Read text from a package data file (zip-safe via importlib.resources).
 
+    read_bytes + decode skips the TextIO/BufferedIO stack that read_text
+    sets up — these files are tiny, so one raw read covers them.
+    """
+    res = resources.files(__package__).joinpath("/".join(rel_parts))
+    return res.read_bytes().decode("utf-8")
 
-def _inline_layers_tex() -> str:
-    """Read and combine all layer style files inline."""
-    parts: list[str] = []
 
-    # Add init.tex content but remove \usepackage lines
-    init = _read_pkg_text("layers", "init.tex")
-    init_lines = [ln for ln in init.splitlines() if not ln.lstrip().startswith("\\usepackage")]
-    parts.append("\n".join(init_lines))
+# Lines stripped when inlining the style files: \usepackage is illegal after
+# \documentclass and \ProvidesPackage only makes sense in a real package.
+_USEPACKAGE_RE = re.compile(r"(?m)^[ \t]*\\usepackage[^\n]*\n?")
+_PROVIDES_RE = re.compile(r"(?m)^[ \t]*\\ProvidesPackage[^\n]*\n?")
+
 
-    # Add style files without the \ProvidesPackage line
+@functools.lru_cache(maxsize=1)
+def _inline_layers_tex() -> str:
+    """Read and combine all layer style files inline.
+
+    The style files never change at runtime, so the concatenation is built
+    once; every subsequent inline-header request is a cache hit instead of
+    four file reads plus filtering. The offending lines are dropped with one
+    compiled-regex pass per file rather than a Python-level line loop.
+    """
+    def filtered(txt: str, pattern: re.Pattern[str]) -> str:
+        out = pattern.sub("", txt)
+        # Drop the file's own final newline; the join below re-adds one.
+        return out[:-1] if out.endswith("\n") else out
+
+    parts: list[str] = [filtered(_read_pkg_text("layers", "init.tex"), _USEPACKAGE_RE)]
     for sty in ("Ball.sty", "Box.sty", "RightBandedBox.sty"):
-        txt = _read_pkg_text("layers", sty)
-        lines = [ln for ln in txt.splitlines() if not ln.lstrip().startswith("\\ProvidesPackage")]
-        parts.append("\n".join(lines))
+        parts.append(filtered(_read_pkg_text("layers", sty), _PROVIDES_RE))
 
     return "\n".join(parts) + "\n"
 
@@ -39,6 +64,7 @@ class LaTeXTemplate:
     """Generates LaTeX document templates for neural network diagrams."""
 
     @staticmethod
+    @functools.cache
     def document_header_inline() -> str:
         """Generate document header with inline styles."""
         return (
@@ -54,6 +80,7 @@ class LaTeXTemplate:
         )
 
     @staticmethod
+    @functools.cache
     def document_header_external() -> str:
         """Generate document header with external style files."""
         pathlayers = _layers_dir_path()
@@ -117,23 +144,31 @@ class LaTeXTemplate:
 
     @classmethod
     def full_document(
-        cls, content: list[str], inline_styles: bool = True, include_colors: bool = True
+        cls, content: Iterable[str], inline_styles: bool = True, include_colors: bool = True
     ) -> str:
-        """Generate complete LaTeX document."""
-        parts = []
-
-        if inline_styles:
-            parts.append(cls.document_header_inline())
-        else:
-            parts.append(cls.document_header_external())
-
-        if include_colors:
-            parts.append(cls.color_definitions())
-
-        parts.append(cls.document_begin())
-
-        parts.extend(content)
-
-        parts.append(cls.document_end())
-
-        return "".join(parts)
+        """Generate complete LaTeX document.
+
+        The ~10KB of constant boilerplate ahead of the content comes from
+        :func:`_preamble`, fused once per (inline, colors) combination; the
+        body is assembled with a single ``"".join`` over a chained iterator —
+        O(n) with no intermediate list growth, whatever iterable the caller
+        passes.
+        """
+        pre = _preamble(inline_styles, include_colors)
+        return "".join(chain((pre,), content, (cls.document_end(),)))
+
+
+@functools.lru_cache(maxsize=4)
+def _preamble(inline_styles: bool, include_colors: bool) -> str:
+    """Everything before the document content, fused per boolean combination.
+
+    Only four variants exist, so each is concatenated exactly once per
+    process and full_document starts from a single prebuilt string.
+    """
+    head = (
+        LaTeXTemplate.document_header_inline()
+        if inline_styles
+        else LaTeXTemplate.document_header_external()
+    )
+    colors = LaTeXTemplate.color_definitions() if include_colors else ""
+    return head + colors + LaTeXTemplate.document_begin()